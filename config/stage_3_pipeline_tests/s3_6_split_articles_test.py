@@ -0,0 +1,73 @@
+"""
+Tests for splitting batched Mystem output back into articles
+"""
+import unittest
+
+import pytest
+
+from pipeline import _split_articles
+
+
+def word(text):
+    """
+    Creates a Mystem analysis of a word token
+    """
+    return {"analysis": [{"lex": text.lower(), "gr": "S"}], "text": text}
+
+
+def gap(text):
+    """
+    Creates a Mystem analysis of a non-word chunk
+    """
+    return {"text": text}
+
+
+class SplitArticlesTest(unittest.TestCase):
+    """
+    Tests for _split_articles realization
+    """
+
+    @pytest.mark.mark4
+    @pytest.mark.mark6
+    @pytest.mark.mark8
+    @pytest.mark.mark10
+    @pytest.mark.stage_3_4_admin_data_processing
+    def test_split_articles_by_separators(self):
+        """
+        Ensure that each separator starts a new article
+        """
+        analyses = [word("Кот"), gap(" . |||| "), word("Дом"), gap(" "),
+                    word("Лес"), gap(". . |||| "), word("Сад"), gap("\n")]
+        chunks = _split_articles(analyses, 3)
+        self.assertEqual([[token["text"] for token in chunk if "analysis" in token]
+                          for chunk in chunks],
+                         [["Кот"], ["Дом", "Лес"], ["Сад"]])
+
+    @pytest.mark.mark4
+    @pytest.mark.mark6
+    @pytest.mark.mark8
+    @pytest.mark.mark10
+    @pytest.mark.stage_3_4_admin_data_processing
+    def test_split_articles_with_several_separators_in_one_chunk(self):
+        """
+        Ensure that an article without words still gets its own chunk
+        """
+        analyses = [word("Кот"), gap(" . ||||  .  . |||| "), word("Дом"),
+                    gap(" . ||||  . |||| ")]
+        chunks = _split_articles(analyses, 5)
+        self.assertEqual([[token["text"] for token in chunk if "analysis" in token]
+                          for chunk in chunks],
+                         [["Кот"], [], ["Дом"], [], []])
+
+    @pytest.mark.mark4
+    @pytest.mark.mark6
+    @pytest.mark.mark8
+    @pytest.mark.mark10
+    @pytest.mark.stage_3_4_admin_data_processing
+    def test_split_articles_fails_on_mismatch(self):
+        """
+        Ensure that output split into a wrong number of articles is rejected
+        """
+        analyses = [word("Кот"), gap(" . |||| "), word("Дом")]
+        with self.assertRaises(ValueError):
+            _split_articles(analyses, 3)
@@ -1,6 +1,7 @@
 """
 Article implementation
 """
+from contextlib import ExitStack
 import json
 import datetime
 
@@ -86,6 +87,23 @@ class Article:
         with open(self.get_file_path(kind), 'w', encoding='utf-8') as file:
             file.write(text)
 
+    def save_artifacts(self, token_forms) -> None:
+        """
+        Creates cleaned, single-tagged and multiple-tagged files in a single pass
+        token_forms: an iterable of (cleaned, single-tagged, multiple-tagged)
+        string forms of each token
+        """
+        kinds = (ArtifactType.cleaned, ArtifactType.single_tagged, ArtifactType.multiple_tagged)
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(self.get_file_path(kind), 'w', encoding='utf-8'))
+                     for kind in kinds]
+            separator = ''
+            for forms in token_forms:
+                for file, form in zip(files, forms):
+                    file.write(separator)
+                    file.write(form)
+                separator = ' '
+
     def _get_meta(self):
         """
         Gets all article params
@@ -24,7 +24,8 @@ class PDFRawFile:
         """
         Downloads PDF file by the URL given.
         """
-        wget.download(self._url, str(ASSETS_PATH / f"{self._id}_raw.pdf"))
+        # no progress bar: downloads may run in parallel and share stdout
+        wget.download(self._url, str(ASSETS_PATH / f"{self._id}_raw.pdf"), bar=None)
 
     def get_text(self):
         """
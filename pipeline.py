@@ -1,14 +1,27 @@
 """
 Pipeline for text processing implementation
 """
-import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import os
 from pathlib import Path
 
 from pymorphy3 import MorphAnalyzer
 from pymystem3 import Mystem
 
 from constants import ASSETS_PATH
-from core_utils.article import Article, ArtifactType
+from core_utils.article import Article
+
+# Every Mystem.analyze call is a round-trip to the subprocess, so several
+# articles are analyzed at once, joined by this separator.
+# Mystem passes the marker through in a non-word chunk, and the full stop
+# keeps disambiguation from looking across two articles.
+_ARTICLE_MARKER = "||||"
+_ARTICLE_SEPARATOR = f" . {_ARTICLE_MARKER} "
+# pymystem3 re-parses all the output it has received after every read from
+# the subprocess, so the cost of one call grows quadratically with its size.
+# Articles are grouped into calls of at most this many characters of text.
+_MYSTEM_CALL_SIZE = 100_000
 
 
 class EmptyDirectoryError(Exception):
@@ -31,6 +44,8 @@ class MorphologicalToken:
     Stores language params for each processed token
     """
 
+    __slots__ = ("original_word", "normalized_form", "tags_mystem", "tags_pymorphy")
+
     def __init__(self, original_word):
         self.original_word = original_word
         self.normalized_form = ""
@@ -53,7 +68,7 @@ class MorphologicalToken:
         """
         Returns normalized lemma with PyMorphy tags
         """
-        return f"{self.normalized_form}<{self.tags_mystem}>({self.tags_pymorphy})"
+        return f"{self.get_single_tagged()}({self.tags_pymorphy})"
 
 
 class CorpusManager:
@@ -81,6 +96,19 @@ class CorpusManager:
         return self._storage
 
 
+# Both analyzers are expensive to construct: Mystem runs a subprocess,
+# MorphAnalyzer loads its dictionaries. Each process creates one instance
+# on first use, so importing this module stays cheap.
+@lru_cache(maxsize=None)
+def _get_mystem():
+    return Mystem()
+
+
+@lru_cache(maxsize=None)
+def _get_morph_analyzer():
+    return MorphAnalyzer()
+
+
 class TextProcessingPipeline:
     """
     Process articles from corpus manager
@@ -93,28 +121,38 @@ class TextProcessingPipeline:
         """
         Runs pipeline process scenario
         """
-        for article in self.corpus_manager.get_articles().values():
-            print(article.article_id)
-            text = article.get_raw_text()
-            tokens = self._process(text)
-            article.save_as(" ".join(map(lambda x: x.get_cleaned(), tokens)),
-                            ArtifactType.cleaned)
-            article.save_as(" ".join(map(lambda x: x.get_single_tagged(), tokens)),
-                            ArtifactType.single_tagged)
-            article.save_as(" ".join(map(lambda x: x.get_multiple_tagged(), tokens)),
-                            ArtifactType.multiple_tagged)
-
-
-
-    def _process(self, raw_text: str):
+        articles = list(self.corpus_manager.get_articles().values())
+        if not articles:
+            return
+        workers = max(1, min(os.cpu_count() or 1, len(articles)))
+        batches = [articles[index::workers] for index in range(workers)]
+        # Each worker process starts its own Mystem subprocess on first use.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # consume the results so that errors in workers are re-raised
+            list(executor.map(self._process_batch, batches))
+
+    def _process_batch(self, articles):
+        """
+        Processes a batch of articles and saves the results
+        """
+        mystem = _get_mystem()
+        for group, texts in _group_articles(articles):
+            analyses = mystem.analyze(_ARTICLE_SEPARATOR.join(texts))
+            for article, article_analyses in zip(group,
+                                                 _split_articles(analyses, len(group))):
+                print(article.article_id)
+                tokens = self._process(article_analyses)
+                article.save_artifacts((token.get_cleaned(),
+                                        token.get_single_tagged(),
+                                        token.get_multiple_tagged()) for token in tokens)
+
+    def _process(self, analyses):
         """
         Processes each token and creates MorphToken class instance
         """
-        mystem = Mystem()
-        morph_analyzer = MorphAnalyzer()
-        # Linebreaks make Mystem slow and unresponsive.
+        morph_analyzer = _get_morph_analyzer()
         tokens = []
-        for analysis in mystem.analyze(raw_text.replace("\n", " ")):
+        for analysis in analyses:
             if "analysis" not in analysis:
                 continue
             if not analysis["analysis"]:
@@ -129,6 +167,44 @@ class TextProcessingPipeline:
         return tokens
 
 
+def _group_articles(articles):
+    """
+    Groups articles with their texts so that each group fits into one Mystem call
+    """
+    group = []
+    texts = []
+    size = 0
+    for article in articles:
+        # Linebreaks make Mystem slow and unresponsive.
+        # markers inside an article would split it, so they are removed first
+        text = article.get_raw_text().replace("\n", " ").replace(_ARTICLE_MARKER, " ")
+        if group and size + len(text) > _MYSTEM_CALL_SIZE:
+            yield group, texts
+            group, texts, size = [], [], 0
+        group.append(article)
+        texts.append(text)
+        size += len(text)
+    if group:
+        yield group, texts
+
+
+def _split_articles(analyses, number_of_articles):
+    """
+    Splits Mystem output for a joined batch back into per-article chunks
+    """
+    chunks = [[]]
+    for analysis in analyses:
+        # one non-word chunk may hold several markers, e.g. after an article without words
+        markers = 0 if "analysis" in analysis else analysis["text"].count(_ARTICLE_MARKER)
+        if not markers:
+            chunks[-1].append(analysis)
+        chunks.extend([] for _ in range(markers))
+    if len(chunks) != number_of_articles:
+        raise ValueError(f"Mystem output is split into {len(chunks)} articles, "
+                         f"expected {number_of_articles}")
+    return chunks
+
+
 def validate_dataset(path_to_validate):
     """
     Validates folder with assets
@@ -138,28 +214,36 @@ def validate_dataset(path_to_validate):
         raise FileNotFoundError
     if not path.is_dir():
         raise NotADirectoryError
-    if not any(path.iterdir()):
+    with os.scandir(path) as scan:
+        entries = list(scan)
+    if not entries:
         raise EmptyDirectoryError
-    for file in path.iterdir():
-        if not file.stat().st_size:
-            raise InconsistentDatasetError("empty file")
 
-    meta_ids = sorted(map(_id_from_path, path.glob("*_meta.json")))
-    raw_ids = sorted(map(_id_from_path, path.glob("*_raw.txt")))
+    meta_ids = set()
+    raw_ids = set()
+    for entry in entries:
+        if not entry.stat().st_size:
+            raise InconsistentDatasetError("empty file")
+        if entry.name.endswith("_meta.json"):
+            meta_ids.add(_id_from_path(entry))
+        elif entry.name.endswith("_raw.txt"):
+            raw_ids.add(_id_from_path(entry))
 
-    if not all(map(lambda a: a[0] == a[1], zip(meta_ids, range(1, len(meta_ids) + 1)))):
+    if meta_ids != set(range(1, len(meta_ids) + 1)):
         raise InconsistentDatasetError("meta files should be listed 1 to N")
-    if not all(map(lambda a: a[0] == a[1], zip(raw_ids, range(1, len(meta_ids) + 1)))):
+    if raw_ids != set(range(1, len(raw_ids) + 1)):
         raise InconsistentDatasetError("raw files should be listed 1 to N")
     if len(meta_ids) != len(raw_ids):
         raise InconsistentDatasetError("uneven number of meta and text files")
 
 
 def _id_from_path(path):
-    path_id = re.sub(r"[^0-9]", "", path.name)
-    if not path_id.isdigit():
-        raise InconsistentDatasetError("file name contains no id")
-    return int(path_id)
+    # file names follow the "{id}_{kind}" pattern
+    path_id = path.name.split("_", 1)[0]
+    try:
+        return int(path_id)
+    except ValueError as error:
+        raise InconsistentDatasetError("file name contains no id") from error
 
 
 def main():
@@ -2,14 +2,19 @@
 Scrapper implementation
 """
 
+import asyncio
+import atexit
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime as dt
 import json
 from pathlib import Path
 import re
 import shutil
 
+import aiohttp
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
 
 from constants import (
     ASSETS_PATH,
@@ -19,6 +24,20 @@ from constants import (
 from core_utils.article import Article
 from core_utils.pdf_utils import PDFRawFile
 
+# Crawling is bound by network latency, so pages are fetched concurrently.
+_CONCURRENT_REQUESTS = 16
+_REQUEST_TIMEOUT = 10
+# Articles are downloaded and parsed in separate processes: PyMuPDF is not
+# thread-safe, and each process gets its own wget state and HTTP session.
+_PARSER_WORKERS = 8
+
+_PRINT_DATE_RE = re.compile(r"(?<=печат[ьи] )[0-9\.]*")
+_URL_SCHEME_RE = re.compile(r"https?://")
+
+# keeps connections alive between requests to the same host
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
 
 class IncorrectURLError(Exception):
     """
@@ -39,14 +58,35 @@ class IncorrectNumberOfArticlesError(Exception):
 
 
 def _clean_text(text):
-    return re.sub(r"[\n\t ]+", " ", text).strip()
+    return " ".join(text.split())
 
 
 def _get_page(link):
-    response = requests.get(link)
+    response = _SESSION.get(link, timeout=_REQUEST_TIMEOUT)
     if not response.ok:
         return None
-    return BeautifulSoup(response.text, "html.parser")
+    return BeautifulSoup(response.content, "lxml")
+
+
+async def _fetch_page(session, link):
+    try:
+        async with session.get(link) as response:
+            if not response.ok:
+                print(f"Skipped {link}: HTTP {response.status}")
+                return None
+            return BeautifulSoup(await response.read(), "lxml")
+    # a single failed page should not abort the rest of the crawl
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        print(f"Skipped {link}: {error!r}")
+        return None
+
+
+def _open_session():
+    connector = aiohttp.TCPConnector(limit=_CONCURRENT_REQUESTS)
+    # a total timeout would also count the wait for a free connection in the pool
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=_REQUEST_TIMEOUT,
+                                    sock_read=_REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
 
 
 class Crawler:
@@ -79,13 +119,16 @@ class Crawler:
         """
         Finds articles
         """
-        for seed in self.seed_urls:
+        asyncio.run(self._find_articles())
+
+    async def _find_articles(self):
+        async with _open_session() as session:
+            pages = await asyncio.gather(*(_fetch_page(session, seed)
+                                           for seed in self.seed_urls))
+        for page in pages:
             if len(self.urls) == self.max_articles:
                 break
-            try:
-                self._extract_url(_get_page(seed))
-            except requests.exceptions.ConnectionError:
-                continue
+            self._extract_url(page)
 
     def get_search_urls(self):
         """
@@ -98,16 +141,23 @@ class CrawlerRecursive(Crawler):
     def __init__(self, seed_urls, max_articles, cached=True):
 
         super().__init__(seed_urls, max_articles)
+        # a dict keeps the discovery order and gives constant-time lookups
+        self.urls = {}
         self._crawled = set()
         self._cached = cached
         if self._cached:
             self.get_cache()
+            # the cache is append-only, so the file stays open for the whole run
+            self._cache_file = open(CRAWLER_CACHE_PATH, "a", encoding="utf-8")
+            atexit.register(self._cache_file.close)
 
     def _add_url(self, href):
+        if href in self.urls:
+            return
         print(len(self.urls))
         if self._cached:
             self.update_cache(href)
-        self.urls.append(href)
+        self.urls[href] = None
 
     def get_cache(self):
         if not CRAWLER_CACHE_PATH.exists():
@@ -115,43 +165,59 @@ class CrawlerRecursive(Crawler):
         if not CRAWLER_CACHE_PATH.stat().st_size:
             return
         with open(CRAWLER_CACHE_PATH, encoding="utf-8") as file:
-            self.urls = file.read().split("\n")
-            self._crawled = set(self.urls)
+            content = file.read()
+        self.urls = dict.fromkeys(content.splitlines())
+        self._crawled = set(self.urls)
+        # older caches have no trailing newline, so new urls would be glued to the last one
+        if not content.endswith("\n"):
+            with open(CRAWLER_CACHE_PATH, "a", encoding="utf-8") as file:
+                file.write("\n")
 
     def update_cache(self, href):
-        with open(CRAWLER_CACHE_PATH, "w", encoding="utf-8") as file:
-            file.write("\n".join(self.urls))
-
-    def find_articles(self):
-        self.recurse(self.seed_urls.pop())
-
-    def recurse(self, seed):
-        if len(self.urls) >= self.max_articles:
-            return
-        if seed in self._crawled:
-            return
-        self._crawled.add(seed)
-
-        try:
-            page = _get_page(seed)
-        except requests.exceptions.ConnectionError:
-            return
+        self._cache_file.write(href + "\n")
+        self._cache_file.flush()
+
+    async def _find_articles(self):
+        async with _open_session() as session:
+            await self._crawl(session, [self.seed_urls.pop()])
+
+    async def _crawl(self, session, seeds):
+        # pages are crawled level by level in the order the links were found.
+        # each level is fetched in slices of concurrent requests,
+        # so crawling stops soon after enough articles are found.
+        while seeds:
+            seeds = [seed for seed in dict.fromkeys(seeds) if seed not in self._crawled]
+            next_seeds = []
+            for start in range(0, len(seeds), _CONCURRENT_REQUESTS):
+                if len(self.urls) >= self.max_articles:
+                    return
+                batch = seeds[start:start + _CONCURRENT_REQUESTS]
+                self._crawled.update(batch)
+                pages = await asyncio.gather(*(_fetch_page(session, seed) for seed in batch))
+                for seed, page in zip(batch, pages):
+                    if page is not None:
+                        next_seeds.extend(self._follow(seed, page))
+            seeds = next_seeds
+
+    def _follow(self, seed, page):
         # if the page is an issue of articles, extract them
         if "showToc" in seed:
             self._extract_url(page)
-            return
-        # if the page is an archive of issues, recurse over them
+            return []
+        # if the page is an archive of issues, crawl over them
+        links = []
         for link in page.find_all("a"):
             if "href" not in link.attrs:
                 continue
             href = link.attrs["href"]
             if "archive" in seed:
                 if "showToc" in href:
-                    self.recurse(href)
-            # also recurse over next pages in archive.
+                    links.append(href)
+            # also crawl over next pages in archive.
             # the order (issues before next page) matters for priority.
             if "archive" in href:
-                self.recurse(href)
+                links.append(href)
+        return links
 
 
 class HTMLParser:
@@ -183,10 +249,16 @@ class HTMLParser:
         topics = [_clean_text(topic.text) for topic in topics]
         self.article.topics = [topic for topic in topics if topic and "," not in topic]
 
-        date = "".join(re.findall(r"(?<=печат[ьи] )[0-9\.]*", self.article.text))[:-1]
+        date = "".join(_PRINT_DATE_RE.findall(self.article.text))[:-1]
         self.article.date = dt.strptime(date, "%d.%m.%Y")
 
 
+def _parse_article(article_id, url):
+    parser = HTMLParser(article_url=url, article_id=article_id)
+    article = parser.parse()
+    article.save_raw()
+
+
 def prepare_environment(base_path):
     """
     Creates ASSETS_PATH folder if not created and removes existing folder
@@ -226,7 +298,7 @@ def validate_config(crawler_path: Path):
 
 
 def _is_valid_url(url_to_validate):
-    return re.match(r"https?://", url_to_validate)
+    return _URL_SCHEME_RE.match(url_to_validate)
 
 
 if __name__ == '__main__':
@@ -235,7 +307,6 @@ if __name__ == '__main__':
     crawler = CrawlerRecursive(seed_urls=seeds, max_articles=limit)
     crawler.find_articles()
 
-    for index, url in enumerate(crawler.urls):
-        parser = HTMLParser(article_url=url, article_id=index+1)
-        article = parser.parse()
-        article.save_raw()
+    with ProcessPoolExecutor(max_workers=_PARSER_WORKERS) as executor:
+        # each article writes only its own numbered files
+        list(executor.map(_parse_article, range(1, len(crawler.urls) + 1), crawler.urls))
@@ -1,18 +1,30 @@
+import mmap
 import re
 
 from pipeline import CorpusManager, validate_dataset
-from pos_frequency_pipeline import get_file
 from constants import ASSETS_PATH, SECOND_PERSON_PATH
 from core_utils.article import ArtifactType
 
+# the tagged files are scanned as raw UTF-8 bytes, so Cyrillic letters
+# are spelled out by their byte ranges: А-п is D0 90-BF, р-я is D1 80-8F
+_CYRILLIC_LETTER = rb"(?:\xd0[\x90-\xbf]|\xd1[\x80-\x8f])"
+# tags never contain spaces or ">", so the match cannot run into the next token
+_SECOND_PERSON_SINGULAR_RE = re.compile(
+    rb"(" + _CYRILLIC_LETTER + rb"*)<V[^\s>]*" + "ед".encode("utf-8")
+    + rb"[^\s>]*" + "2-л".encode("utf-8") + rb"[^\s>]*>"
+)
+
 if __name__ == "__main__":
     validate_dataset(ASSETS_PATH)
     corpus_manager = CorpusManager(ASSETS_PATH)
     matches = []
     for article in corpus_manager.get_articles().values():
-        print(article.article_id)
-        tagged = get_file(article, ArtifactType.single_tagged)
-        for match in re.findall(r"([А-Яа-я]*)<V\S*(ед)\S*(2-л)\S*>", tagged):
-            matches.append(match[0])
+        path = article.get_file_path(ArtifactType.single_tagged)
+        # the file is mapped rather than read, so pages are loaded lazily
+        # and no decoded copy of the whole text is made
+        with open(path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as tagged:
+            for match in _SECOND_PERSON_SINGULAR_RE.finditer(tagged):
+                matches.append(match.group(1).decode("utf-8"))
     with SECOND_PERSON_PATH.open("w", encoding="utf-8") as file:
         file.write(" ".join(matches))
\ No newline at end of file